@@ -1,13 +1,24 @@
 import streamlit as st
 import pandas as pd
-import os
+import numpy as np
+import pyarrow as pa
+import pyarrow.feather as feather
+import csv
+import hashlib
+import io
 import json
+import os
+
+from scoring import calculate_score, parse_heights
 
 # --- CONFIGURATION ---
 st.set_page_config(page_title="High Jump Scorer", layout="wide")
 
 # 1. LOCAL BACKUP (Saves full app state so you can refresh page/restart app)
-LOCAL_BACKUP_FILE = "highjump_state_backup.csv"
+LOCAL_BACKUP_FILE = "highjump_state_backup.feather"
+# Backups from older versions (Parquet, then JSON results in a CSV), read once and rewritten if no current backup exists
+LEGACY_PARQUET_BACKUP_FILE = "highjump_state_backup.parquet"
+LEGACY_CSV_BACKUP_FILE = "highjump_state_backup.csv"
 
 # 2. GOOGLE DRIVE SYNC (Saves clean results for the Live Scoreboard)
 # We use r"" to ensure Windows backslashes are read correctly
@@ -15,135 +26,208 @@ DRIVE_FOLDER = r"G:\My Drive\Sports Day results"
 
 # --- HELPER FUNCTIONS ---
 
-def calculate_score(competitor):
-    """Calculates Best Height, Failures at Best, and Total Failures."""
-    results = competitor.get('results', {})
-    best_height = 0.0
-    failures_at_best = 0
-    
-    # 1. Find Best Height
-    for height_label, result in results.items():
-        if not result: continue
-        try: 
-            height_val = float(height_label)
-            # Check for clearance (O)
-            if 'O' in result.upper():
-                if height_val > best_height:
-                    best_height = height_val
-                    # Count failures at this specific new best height
-                    failures_at_best = result.upper().count('X')
-        except ValueError: 
-            continue
-            
-    # 2. Calculate Total Failures (up to and including best height)
-    total_failures = 0
-    for height_label, result in results.items():
-        try: 
-            h_val = float(height_label)
-            # Only count failures for heights that were attempted
-            if result: 
-                total_failures += result.upper().count('X')
-        except ValueError: 
-            continue
-            
-    return best_height, failures_at_best, total_failures
+@st.cache_resource
+def _backup_writer():
+    """Backup path and Arrow schema, built once per server process and reused by every save."""
+    return {
+        "path": LOCAL_BACKUP_FILE,
+        "schema": pa.schema([
+            ("Category", pa.string()),
+            ("House", pa.string()),
+            ("Name", pa.string()),
+            ("Heights_Str", pa.string()),
+            ("heights", pa.list_(pa.string())),
+            ("marks", pa.list_(pa.string())),
+        ]),
+    }
+
+def athlete_score(athlete):
+    """(best, fails, total) for one athlete, kept on the dict as '_score' so untouched athletes aren't rescored."""
+    score = athlete.get('_score')
+    if score is None:
+        score = athlete['_score'] = calculate_score(athlete)
+    return score
+
+def set_result(athlete, h_str, val):
+    """Writes one mark and refreshes only that athlete's cached score."""
+    athlete['results'][h_str] = val
+    athlete['_score'] = calculate_score(athlete)
+
+def prime_scores(athletes):
+    """Fills every athlete's cached score (used after loading)."""
+    for athlete in athletes:
+        athlete['_score'] = calculate_score(athlete)
+
+def results_frame(athletes, height_keys):
+    """One column per height key (e.g. '1.2'), one row per athlete, built in a single DataFrame call. Blank = no result yet."""
+    return pd.DataFrame([a['results'] for a in athletes]).reindex(columns=height_keys).fillna("")
 
 def save_local_state():
-    """Saves the full app state (every X and O) to a local CSV."""
-    if st.session_state.data:
-        export_data = []
-        for d in st.session_state.data:
-            row = d.copy()
-            # Convert the results dictionary to a string so it fits in one CSV cell
-            row['results'] = json.dumps(d['results']) 
-            export_data.append(row)
+    """Saves the full app state (every X and O) to a local Feather (Arrow) file."""
+    data = st.session_state.data
+    if data:
+        writer = _backup_writer()
+        # Store each results dictionary as two parallel list columns (height keys, marks)
+        table = pa.Table.from_pydict({
+            "Category": [d['Category'] for d in data],
+            "House": [d['House'] for d in data],
+            "Name": [d['Name'] for d in data],
+            "Heights_Str": [d['Heights_Str'] for d in data],
+            "heights": [list(d['results'].keys()) for d in data],
+            "marks": [list(d['results'].values()) for d in data],
+        }, schema=writer['schema'])
         
-        df = pd.DataFrame(export_data)
-        df.to_csv(LOCAL_BACKUP_FILE, index=False)
+        # Write to a temp file then swap it in, so a crash mid-write never leaves a broken backup
+        tmp_path = writer['path'] + ".tmp"
+        feather.write_feather(table, tmp_path, compression='lz4')
+        os.replace(tmp_path, writer['path'])
 
 def save_to_drive(category_name):
     """
     Saves a clean Leaderboard CSV to Google Drive for the Live Scoreboard.
     Filename format: 'Highjump_Senior Boys.csv'
     """
-    # Safety Check: Does the folder exist?
+    # Safety Check: Does the folder exist? (checked once at startup, see _drive_ok)
     target_folder = DRIVE_FOLDER
-    if not os.path.exists(target_folder):
+    if not st.session_state.get('_drive_ok'):
         # Fallback: specific warning but don't crash
         # st.toast(f"⚠️ Drive folder not found! Saving locally only.", icon="Vc")
         return 
 
     # Filter data for just this category
-    cat_data = [d for d in st.session_state.data if d['Category'] == category_name]
+    cat_data = category_athletes(category_name)
     
     if not cat_data:
         return
 
-    # Build the clean leaderboard
-    leaderboard = []
-    for athlete in cat_data:
-        best, fails, total = calculate_score(athlete)
-        leaderboard.append({
-            "Rank": 0, # Placeholder, Sheet logic handles sorting visually if needed
-            "Name": athlete['Name'],
-            "House": athlete['House'],
-            "Best": best,
-            "Fails@Best": fails,
-            "TotalFails": total
-        })
-
-    df = pd.DataFrame(leaderboard)
+    # Build the clean leaderboard as plain tuples: (best, fails, total, name, house)
+    scored = [(*athlete_score(athlete), athlete['Name'], athlete['House']) for athlete in cat_data]
     
-    if not df.empty:
-        # Sort: Highest Best -> Lowest Fails@Best -> Lowest TotalFails
-        df = df.sort_values(by=["Best", "Fails@Best", "TotalFails"], ascending=[False, True, True])
-        
-        # Add Rank
-        df.reset_index(drop=True, inplace=True)
-        df.index += 1
-        df["Rank"] = df.index
-
-        # Reorder columns for the Sheet
-        df = df[["Rank", "Name", "House", "Best", "Fails@Best", "TotalFails"]]
-        
-        # Construct Filename
-        filename = f"Highjump_{category_name}.csv"
-        full_path = os.path.join(target_folder, filename)
-        
+    # Sort: Highest Best -> Lowest Fails@Best -> Lowest TotalFails
+    scored.sort(key=lambda r: (-r[0], r[1], r[2]))
+    
+    # Add Rank and order columns for the Sheet
+    rows = [(rank, name, house, best, fails, total) for rank, (best, fails, total, name, house) in enumerate(scored, start=1)]
+    
+    # Construct Filename
+    filename = f"Highjump_{category_name}.csv"
+    full_path = os.path.join(target_folder, filename)
+    
+    # Serialize with the plain csv module (no vectorized work here for pandas to help with)
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    w.writerow(["Rank", "Name", "House", "Best", "Fails@Best", "TotalFails"])
+    w.writerows(rows)
+    payload = buf.getvalue().encode('utf-8')
+    
+    # Skip the Drive write entirely if this category's CSV is byte-identical to the last one written
+    digest = hashlib.blake2b(payload, digest_size=8).digest()
+    last_hashes = st.session_state.setdefault('_last_drive_hash', {})
+    if last_hashes.get(category_name) == digest:
+        return
+    
+    # Write a temp file then swap it in so Drive never syncs a half-written CSV
+    tmp_path = full_path + ".tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, full_path)
+        last_hashes[category_name] = digest
+        # success toast removed to avoid spamming the user
+    except Exception as e:
+        # Don't leave the temp file in the synced folder (e.g. os.replace fails while Drive holds the CSV)
         try:
-            df.to_csv(full_path, index=False)
-            # success toast removed to avoid spamming the user
-        except Exception as e:
-            st.error(f"Could not save to Drive: {e}")
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        st.error(f"Could not save to Drive: {e}")
+
+def flush_saves():
+    """Runs the saves marked dirty during this run: local backup once, then each changed category to Drive."""
+    if st.session_state.get('_dirty_local'):
+        save_local_state()
+        st.session_state._dirty_local = False
+    if st.session_state.get('_dirty_drive_cats'):
+        for category_name in sorted(st.session_state._dirty_drive_cats):
+            save_to_drive(category_name)
+        st.session_state._dirty_drive_cats = set()
 
 def load_local_state():
-    """Restores the app state from the local backup file on startup."""
-    if os.path.exists(LOCAL_BACKUP_FILE):
+    """Restores the app state from the local backup file on startup (or from a legacy backup if that's all there is)."""
+    # The Parquet backup has the same list columns as the Feather one
+    for path, read in ((LOCAL_BACKUP_FILE, pd.read_feather), (LEGACY_PARQUET_BACKUP_FILE, pd.read_parquet)):
+        if not os.path.exists(path):
+            continue
+        try:
+            df = read(path)
+            # Zip the height/mark columns back into each athlete's results dictionary,
+            # upper-casing marks so scoring can rely on them already being normalized
+            return [{
+                "Category": r['Category'],
+                "House": r['House'],
+                "Name": r['Name'],
+                "Heights_Str": r['Heights_Str'],
+                "Heights_List": list(parse_heights(r['Heights_Str'])),
+                "results": {h: m.upper() for h, m in zip(r['heights'], r['marks'])}
+            } for r in df.to_dict('records')]
+        except Exception:
+            return []
+    return load_legacy_csv_state()
+
+def load_legacy_csv_state():
+    """Reads the old JSON-in-CSV backup (one row per athlete, results as a JSON string)."""
+    if os.path.exists(LEGACY_CSV_BACKUP_FILE):
         try:
-            df = pd.read_csv(LOCAL_BACKUP_FILE)
+            df = pd.read_csv(LEGACY_CSV_BACKUP_FILE, dtype=str).fillna("")
             data = []
-            for _, row in df.iterrows():
-                item = row.to_dict()
-                # Parse the 'results' string back into a dictionary
-                if isinstance(item['results'], str):
-                    try:
-                        item['results'] = json.loads(item['results'])
-                    except:
-                        item['results'] = {}
-                else:
-                    item['results'] = {}
-                data.append(item)
+            for r in df.to_dict('records'):
+                try:
+                    results = json.loads(r['results']) if r['results'] else {}
+                except ValueError:
+                    results = {}
+                data.append({
+                    "Category": r['Category'],
+                    "House": r['House'],
+                    "Name": r['Name'],
+                    "Heights_Str": r['Heights_Str'],
+                    "Heights_List": list(parse_heights(r['Heights_Str'])),
+                    "results": {str(h): str(m).upper() for h, m in results.items()}
+                })
             return data
         except Exception:
             return []
     return []
 
-def parse_heights(height_str):
-    """Parses '1.20, 1.25' into a list of floats."""
-    try: 
-        return [float(h.strip()) for h in str(height_str).split(',') if h.strip()]
-    except: 
-        return []
+@st.cache_data(show_spinner=False)
+def _read_csv(data):
+    """Parses an uploaded start list. Cached on the file's bytes, so loading the same file twice is free."""
+    return pd.read_csv(io.BytesIO(data))
+
+def rebuild_category_index():
+    """Maps each Category to its athlete dicts (same objects as st.session_state.data). Call after data changes."""
+    by_cat = {}
+    for d in st.session_state.data:
+        by_cat.setdefault(d['Category'], []).append(d)
+    st.session_state.by_cat = by_cat
+    # New dataset, new grid: the editor key includes this, so a kept edit can't land on a different athlete
+    st.session_state._data_gen = st.session_state.get('_data_gen', 0) + 1
+    _refresh_categories()
+    st.session_state._heights = {}
+    _refresh_heights()
+
+def _refresh_categories():
+    """Stores the sorted category list so reruns don't rebuild it from every athlete."""
+    st.session_state._cats = sorted(st.session_state.by_cat)
+
+def _refresh_heights(category_name=None):
+    """Stores each category's sorted heights. Pass a category to refresh only that one (e.g. after Add Height)."""
+    by_cat = st.session_state.by_cat
+    for cat in ([category_name] if category_name is not None else by_cat):
+        st.session_state._heights[cat] = sorted(set().union(*[d['Heights_List'] for d in by_cat.get(cat, [])]))
+
+def category_athletes(category_name):
+    """Returns the athlete dicts for one category via the category index (no scan of all athletes)."""
+    return st.session_state.by_cat.get(category_name, [])
 
 # --- APP STARTUP ---
 
@@ -152,9 +236,23 @@ if 'data' not in st.session_state:
     backup = load_local_state()
     if backup:
         st.session_state.data = backup
+        prime_scores(backup)
+        if not os.path.exists(LOCAL_BACKUP_FILE):
+            # Restored from a legacy backup: write it in the current format at the end of this run
+            st.session_state._dirty_local = True
         st.toast("Restored data from local backup!", icon="💾")
     else:
         st.session_state.data = []
+if 'by_cat' not in st.session_state:
+    rebuild_category_index()
+
+# Check the Drive folder once per session rather than on every save
+if '_drive_ok' not in st.session_state:
+    st.session_state._drive_ok = os.path.exists(DRIVE_FOLDER)
+
+# Pending saves, flushed once at the end of each run
+st.session_state.setdefault('_dirty_local', False)
+st.session_state.setdefault('_dirty_drive_cats', set())
 
 # --- SIDEBAR ---
 with st.sidebar:
@@ -164,21 +262,23 @@ with st.sidebar:
     if uploaded_file:
         if st.button("Load Data (Overwrites current)"):
             try:
-                df = pd.read_csv(uploaded_file)
+                df = _read_csv(uploaded_file.getvalue())
                 # Clean headers
                 df.columns = [c.strip() for c in df.columns]
                 
-                # Reset Data
-                st.session_state.data = []
-                for _, row in df.iterrows():
-                    st.session_state.data.append({
-                        "Category": str(row['Category']),
-                        "House": str(row['House']),
-                        "Name": str(row['Name']),
-                        "Heights_Str": str(row['Heights']), # e.g. "1.20, 1.25"
-                        "results": {}
-                    })
-                save_local_state()
+                # Reset Data (one C-level conversion instead of a Series per row)
+                records = df[['Category', 'House', 'Name', 'Heights']].fillna("").astype(str).to_dict('records')
+                st.session_state.data = [{
+                    "Category": r['Category'],
+                    "House": r['House'],
+                    "Name": r['Name'],
+                    "Heights_Str": r['Heights'], # e.g. "1.20, 1.25"
+                    "Heights_List": list(parse_heights(r['Heights'])), # Parsed once, e.g. [1.2, 1.25]
+                    "results": {}
+                } for r in records]
+                prime_scores(st.session_state.data)
+                rebuild_category_index()
+                st.session_state._dirty_local = True
                 st.success("Start list loaded!")
                 st.rerun()
             except Exception as e:
@@ -186,138 +286,150 @@ with st.sidebar:
     
     st.divider()
     if st.button("🗑️ Clear All Data"):
-        if os.path.exists(LOCAL_BACKUP_FILE):
-            os.remove(LOCAL_BACKUP_FILE)
+        # Remove any legacy backup too, or it would be restored again on the next start
+        for path in (LOCAL_BACKUP_FILE, LEGACY_PARQUET_BACKUP_FILE, LEGACY_CSV_BACKUP_FILE):
+            if os.path.exists(path):
+                os.remove(path)
         st.session_state.data = []
+        rebuild_category_index()
         st.rerun()
         
     st.info(f"Syncing to:\n{DRIVE_FOLDER}")
 
-# --- MAIN INTERFACE ---
-st.title("High Jump Manager")
-
-if not st.session_state.data:
-    st.info("Upload a start list CSV to begin.")
-else:
-    # 1. Select Category
-    categories = sorted(list(set(d['Category'] for d in st.session_state.data)))
-    
-    col_cat, col_add = st.columns([2, 1])
-    with col_cat:
-        selected_cat = st.selectbox("Select Category", categories)
-        
-    # 2. Add New Height Logic
-    with col_add:
-        with st.form("add_height_form"):
-            new_h = st.number_input("Add New Height", 0.50, 2.50, 1.35, step=0.01)
-            if st.form_submit_button("Add Height"):
-                # Add this height to everyone in this category
-                for d in st.session_state.data:
-                    if d['Category'] == selected_cat:
-                        current_heights = parse_heights(d['Heights_Str'])
-                        if new_h not in current_heights:
-                            d['Heights_Str'] += f", {new_h}"
-                save_local_state()
-                st.rerun()
+# --- SCORING VIEW ---
 
+@st.fragment
+def _score_fragment(selected_cat):
+    """Scoring matrix + leaderboard for one category, rerun on its own when scores are saved."""
     # 3. Prepare Data for Display
     # Filter for category
-    cat_data = [d for d in st.session_state.data if d['Category'] == selected_cat]
+    cat_data = category_athletes(selected_cat)
     
-    # Get all unique heights for this category and sort them
-    all_heights = set()
-    for d in cat_data:
-        all_heights.update(parse_heights(d['Heights_Str']))
-    sorted_heights = sorted(list(all_heights))
+    # All unique heights for this category, sorted (refreshed only when heights change)
+    sorted_heights = st.session_state._heights.get(selected_cat, [])
+    # Their results-dict keys, converted once per run
+    height_keys = list(map(str, sorted_heights))
 
     st.divider()
 
-    # 4. Scoring Matrix
-    for idx, athlete in enumerate(st.session_state.data):
-        # Skip athletes not in selected category
-        if athlete['Category'] != selected_cat: 
-            continue
+    # 4. Scoring Matrix (one editable grid for the whole category, one row per athlete)
+    grid = pd.concat([pd.DataFrame(cat_data, columns=["Name", "House"]), results_frame(cat_data, height_keys)], axis=1)
+    
+    column_config = {
+        "Name": st.column_config.TextColumn("Name"),
+        "House": st.column_config.TextColumn("House", disabled=True),
+    }
+    for h, h_str in zip(sorted_heights, height_keys):
+        column_config[h_str] = st.column_config.TextColumn(f"{h}m", max_chars=3)
+    
+    # Batch grid edits in a form so they're applied once, on Save
+    with st.form(f"grid_form_{selected_cat}"):
+        edited = st.data_editor(
+            grid,
+            column_config=column_config,
+            num_rows="fixed",
+            hide_index=True,
+            width="stretch",
+            key=f"editor_{selected_cat}_{st.session_state._data_gen}"
+        )
+        if not sorted_heights:
+            st.caption("No heights added yet.")
+        submitted = st.form_submit_button("Save")
+    
+    if submitted:
+        # Diff the whole grid at once and only touch the cells that changed
+        edited = edited.fillna("")
+        # Marks are stored upper-case, so compare them that way (a kept 'xo' isn't a change)
+        if height_keys:
+            edited[height_keys] = edited[height_keys].apply(lambda marks: marks.astype(str).str.upper())
+        rows, cols = np.nonzero(edited.ne(grid).to_numpy())
+        for r, c in zip(rows, cols):
+            athlete, col, val = cat_data[r], edited.columns[c], edited.iat[r, c]
+            if col == "Name":
+                athlete['Name'] = val
+            else:
+                set_result(athlete, col, val)
         
-        # Use an expander for each athlete
-        with st.expander(f"🏅 {athlete['Name']} ({athlete['House']})", expanded=True):
-            c1, c2 = st.columns([1, 4])
-            
-            # Left Column: Name Edit
-            with c1:
-                new_name = st.text_input("Name", athlete['Name'], key=f"name_{idx}")
-                if new_name != athlete['Name']:
-                    athlete['Name'] = new_name
-                    save_local_state()
-                    save_to_drive(selected_cat) # Update Drive immediately
-            
-            # Right Column: Height Inputs
-            with c2:
-                # Create dynamic columns for heights
-                if sorted_heights:
-                    h_cols = st.columns(len(sorted_heights))
-                    for i, h in enumerate(sorted_heights):
-                        h_str = str(h)
-                        
-                        # Existing result or empty
-                        current_val = athlete['results'].get(h_str, "")
-                        
-                        with h_cols[i]:
-                            val = st.text_input(
-                                f"{h}m", 
-                                value=current_val,
-                                key=f"res_{idx}_{h_str}",
-                                placeholder="-"
-                            )
-                            
-                            # If value changed, save EVERYTHING
-                            if val.upper() != current_val:
-                                athlete['results'][h_str] = val.upper()
-                                save_local_state()        # Backup to laptop
-                                save_to_drive(selected_cat) # Sync to Google Drive
-                else:
-                    st.caption("No heights added yet.")
+        # If anything changed, save EVERYTHING once for the whole grid
+        if len(rows):
+            st.session_state._dirty_local = True # Backup to laptop (flushed below)
+            st.session_state._dirty_drive_cats.add(selected_cat) # Sync to Google Drive (flushed below)
 
     # 5. Leaderboard Section
     st.header(f"Leaderboard: {selected_cat}")
     
-    leaderboard = []
-    for athlete in cat_data:
-        best, fails, total = calculate_score(athlete)
-        
-        row = {
-            "Name": athlete['Name'],
-            "House": athlete['House'],
-            "Best": best,
-            "Fails@Best": fails,
-            "TotalFails": total
-        }
-        # Add individual heights for the display table
-        for h in sorted_heights:
-            row[str(h)] = athlete['results'].get(str(h), "")
-            
-        leaderboard.append(row)
+    # Read each athlete's cached score (only edited athletes were rescored)
+    # and sort on plain tuples: Highest Best -> Lowest Fails@Best -> Lowest TotalFails
+    scored = sorted(
+        ((*athlete_score(athlete), athlete) for athlete in cat_data),
+        key=lambda r: (-r[0], r[1], r[2])
+    )
+    ranked = [r[3] for r in scored]
+    
+    # Build the table already in rank order (index is the Rank)
+    df_disp = pd.concat([
+        pd.DataFrame(ranked, columns=["Name", "House"]),
+        pd.DataFrame([r[:3] for r in scored], columns=["Best", "Fails@Best", "TotalFails"]),
+    ], axis=1)
+    df_disp.index = range(1, len(scored) + 1)
     
-    df_disp = pd.DataFrame(leaderboard)
+    def build_full_csv():
+        """Wide CSV (scores + every height) for the download, only built when the button is clicked."""
+        heights_df = results_frame(ranked, height_keys).set_axis(df_disp.index)
+        return pd.concat([df_disp, heights_df], axis=1).to_csv().encode('utf-8')
     
     if not df_disp.empty:
-        # Sort logic
-        df_disp = df_disp.sort_values(by=["Best", "Fails@Best", "TotalFails"], ascending=[False, True, True])
-        
-        # Add Rank
-        df_disp.reset_index(drop=True, inplace=True)
-        df_disp.index += 1
-        
-        # Show table
+        # Show table, highlighting the top Best with one column-wise pass (cheaper than highlight_max)
+        best_max = df_disp["Best"].max()
         st.dataframe(
-            df_disp.style.highlight_max(axis=0, subset=["Best"], color="#90ee90"), 
-            use_container_width=True
+            df_disp.style.apply(
+                lambda col: ["background-color: #90ee90" if v == best_max else "" for v in col],
+                subset=["Best"]
+            ), 
+            width="stretch"
         )
         
         # Manual Download Button (Optional, since we auto-sync)
-        csv = df_disp.to_csv().encode('utf-8')
         st.download_button(
             label="Download CSV",
-            data=csv,
+            data=build_full_csv,
             file_name=f"Highjump_{selected_cat}.csv",
             mime="text/csv"
         )
+
+    # Fragment reruns skip the end of the script, so flush pending saves here too
+    flush_saves()
+
+# --- MAIN INTERFACE ---
+st.title("High Jump Manager")
+
+if not st.session_state.data:
+    st.info("Upload a start list CSV to begin.")
+else:
+    # 1. Select Category
+    categories = st.session_state.setdefault('_cats', [])
+    
+    col_cat, col_add = st.columns([2, 1])
+    with col_cat:
+        selected_cat = st.selectbox("Select Category", categories)
+        
+    # 2. Add New Height Logic
+    with col_add:
+        with st.form("add_height_form"):
+            new_h = st.number_input("Add New Height", 0.50, 2.50, 1.35, step=0.01)
+            if st.form_submit_button("Add Height"):
+                # Add this height to everyone in this category
+                for d in category_athletes(selected_cat):
+                    if new_h not in d['Heights_List']:
+                        d['Heights_List'].append(new_h)
+                        d['Heights_Str'] += f", {new_h}" # Kept in sync for the backup
+                _refresh_heights(selected_cat)
+                st.session_state._dirty_local = True
+                st.rerun()
+
+    # 3-5. Scoring Matrix + Leaderboard (reruns on its own on Save)
+    _score_fragment(selected_cat)
+
+# --- END OF RUN ---
+# Write the local backup and Drive leaderboards at most once per script run
+flush_saves()
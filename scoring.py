@@ -0,0 +1,59 @@
+import re
+from functools import lru_cache
+
+# Pure scoring helpers. They live in their own module (not highjump.py) because Streamlit
+# re-executes the app script on every rerun, which would throw away these caches each time;
+# an imported module is only loaded once per server process.
+
+# --- PARSING ---
+
+# A valid mark is up to 3 attempts of X (fail), O (clear) or - (pass); anything else isn't scored
+_MARK = re.compile(r'^[XO\-]{0,3}$')
+_COUNTS = re.compile(r'([XO])')
+
+@lru_cache(maxsize=4096)
+def _pf(height_label):
+    """Parses a height key like '1.20' to a float (None if invalid). Cached since keys repeat across athletes."""
+    try: 
+        return float(height_label)
+    except ValueError: 
+        return None
+
+@lru_cache(maxsize=256)
+def parse_heights(height_str):
+    """Parses '1.20, 1.25' into a tuple of floats (cached, so it must not be mutated)."""
+    try: 
+        return tuple(float(h.strip()) for h in str(height_str).split(',') if h.strip())
+    except: 
+        return ()
+
+# --- PER-ATHLETE SCORING ---
+
+@lru_cache(maxsize=4096)
+def _calc_score_cached(results_items):
+    """Scores a frozen tuple of (height_str, result_str) pairs."""
+    # Parse each attempted height once: (height, failures, cleared)
+    parsed = []
+    for height_label, result in results_items:
+        if not result: continue
+        height_val = _pf(height_label)
+        if height_val is None: continue
+        # Results are stored upper-case at every input site, so no .upper() here
+        if not _MARK.match(result): continue
+        tags = _COUNTS.findall(result)
+        parsed.append((height_val, tags.count('X'), 'O' in tags))
+    
+    # Best Height is the highest clearance (fewest failures breaks a duplicate-height tie)
+    cleared = [(height_val, fails) for height_val, fails, is_clear in parsed if is_clear]
+    best_height, failures_at_best = max(cleared, key=lambda t: (t[0], -t[1])) if cleared else (0.0, 0)
+    
+    # Total Failures (up to and including best height)
+    total_failures = sum(fails for height_val, fails, _ in parsed if height_val <= best_height)
+            
+    return best_height, failures_at_best, total_failures
+
+def calculate_score(competitor):
+    """Calculates Best Height, Failures at Best, and Total Failures."""
+    # Freeze the results so unchanged athletes are served from the cache
+    results_items = tuple(sorted(competitor.get('results', {}).items()))
+    return _calc_score_cached(results_items)